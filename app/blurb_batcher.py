@@ -0,0 +1,102 @@
+# app/blurb_batcher.py
+import json
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+
+# Tuning knobs: a 50 ms debounce window groups bursts (e.g. a category page
+# fanning out to many /item calls) into one multi-title prompt.
+BATCH_WINDOW_S = 0.05
+BATCH_MAX = 16
+MAX_CONCURRENT = 8
+MAX_RETRIES = 3
+
+_BATCH_PROMPT = ChatPromptTemplate.from_template(
+    "For each numbered product title below, write a short, creative, "
+    "under-60-word blurb highlighting materials, design vibe, and one "
+    "specific use-case. Vary the tone. Return ONLY a JSON array of {n} "
+    "strings, in order.\n\n{titles}"
+)
+
+
+class BlurbBatcher:
+    """
+    Coalesces near-simultaneous blurb requests into one LLM call.
+
+    Callers await submit(title); a background task drains the queue every
+    BATCH_WINDOW_S (up to BATCH_MAX titles), sends a single prompt asking for
+    a JSON array, and resolves each caller's future. A semaphore caps
+    concurrent LLM calls and failures retry with exponential backoff, so
+    bursty traffic stops tripping OpenRouter RPM limits.
+    """
+
+    def __init__(self, llm):
+        self._chain = _BATCH_PROMPT | llm | StrOutputParser()
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT)
+        self._task: Optional[asyncio.Task] = None
+        # The loop only keeps weak refs to tasks; hold ours so an in-flight
+        # batch can't be garbage-collected with callers still awaiting it
+        self._inflight: set = set()
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # Fail anything still queued so awaiting callers don't hang forever
+        while not self._queue.empty():
+            _, fut = self._queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(RuntimeError("blurb batcher stopped"))
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def submit(self, title: str) -> str:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((title, fut))
+        return await fut
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                while len(batch) < BATCH_MAX:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=BATCH_WINDOW_S))
+            except asyncio.TimeoutError:
+                pass
+            task = asyncio.get_running_loop().create_task(self._process(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _process(self, batch: List[Tuple[str, asyncio.Future]]):
+        titles = [t for t, _ in batch]
+        numbered = "\n".join(f"{i + 1}. {t}" for i, t in enumerate(titles))
+        delay = 1.0
+        async with self._sem:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    raw = (await asyncio.to_thread(self._chain.invoke, {"n": len(titles), "titles": numbered})).strip()
+                    raw = raw[raw.index("["):raw.rindex("]") + 1]
+                    blurbs = json.loads(raw)
+                    if len(blurbs) != len(titles):
+                        raise ValueError(f"expected {len(titles)} blurbs, got {len(blurbs)}")
+                    for (_, fut), blurb in zip(batch, blurbs):
+                        if not fut.done():
+                            fut.set_result(str(blurb).strip())
+                    return
+                except Exception as e:
+                    if attempt < MAX_RETRIES - 1:
+                        logging.warning(f"⚠️ Blurb batch failed (attempt {attempt + 1}): {e}")
+                        await asyncio.sleep(delay)
+                        delay *= 2
+                        continue
+                    for _, fut in batch:
+                        if not fut.done():
+                            fut.set_exception(e)
@@ -18,6 +18,14 @@ if DATABASE_URL is None:
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
+    # Default pool (5 + 10 overflow) causes connection-wait spikes under
+    # bursty FastAPI traffic; LIFO reuse keeps connections warm and recycle
+    # beats idle timeouts on managed Postgres.
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=1800,
+    pool_use_lifo=True,
+    query_cache_size=1200,  # keep compiled SQL for the hot PK lookups cached
     # The check for 'sqlite' is no longer the primary path but is good practice
     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 )
@@ -1,30 +1,88 @@
 # app/main.py
 import os
 import re
+import asyncio
+import hashlib
 import logging
 import spacy
+from contextlib import asynccontextmanager
 from urllib.parse import unquote
 from typing import List
 from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 
 from fastapi import FastAPI, Depends, HTTPException
+from sqlalchemy import inspect, text
 from sqlalchemy.orm import Session
-from sqlalchemy import select
 
 from .db import Base, engine, get_db
-from .models import Product
+from .models import Product, Blurb
 from .schemas import SearchRequest, SearchResponse, ProductCard, ProductDetail
-from .pinecone_client import embed_text, query_index
+from .pinecone_client import KEYWORD_FILTER, embed_text, embed_cache_info, query_index, warm_up
 from .deps import add_cors
-from .normalize import normalize_listing
+from .blurb_batcher import BlurbBatcher
+from .normalize import normalize_listing, normalize_creative
 
 # ---------------------------------------------------------
 # 🚀 Initialization
 # ---------------------------------------------------------
-Base.metadata.create_all(bind=engine)
-app = FastAPI(title="Furniture Recommendation API", version="3.1.0")
+# spaCy model is loaded in the lifespan handler, not at import time,
+# so each uvicorn worker can start accepting traffic immediately.
+nlp = None
+
+# extract_keyword only reads token.pos_, so keep tok2vec + tagger plus the
+# attribute_ruler (it maps fine-grained TAG to the coarse POS we read);
+# parser/NER/lemmatizer are dead weight (~hundreds of MB RSS per worker)
+_DISABLED_PIPES = ["parser", "ner", "lemmatizer", "senter"]
+
+def _load_nlp():
+    try:
+        return spacy.load("en_core_web_sm", disable=_DISABLED_PIPES)
+    except OSError:
+        import spacy.cli
+        spacy.cli.download("en_core_web_sm")
+        return spacy.load("en_core_web_sm", disable=_DISABLED_PIPES)
+
+# Columns added to products after the original schema shipped; create_all
+# never ALTERs existing tables, so patch them in at startup (idempotent).
+_NEW_PRODUCT_COLUMNS = {
+    "norm_title": "VARCHAR",
+    "norm_description": "TEXT",
+    "features": "JSON",
+    "dimensions": "JSON",
+}
+
+def _migrate_product_columns():
+    insp = inspect(engine)
+    if not insp.has_table("products"):
+        return
+    existing = {c["name"] for c in insp.get_columns("products")}
+    missing = [c for c in _NEW_PRODUCT_COLUMNS if c not in existing]
+    if not missing:
+        return
+    with engine.begin() as conn:
+        for name in missing:
+            conn.execute(text(f"ALTER TABLE products ADD COLUMN {name} {_NEW_PRODUCT_COLUMNS[name]}"))
+    print(f"✅ Added columns to products: {', '.join(missing)}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global nlp
+    # Schema creation is a one-shot deploy step, not a per-worker cost
+    if os.getenv("RUN_MIGRATIONS") == "1":
+        Base.metadata.create_all(bind=engine)
+    # The blurb cache table and normalized product columns are newer than
+    # most deployments' schemas; patch them in so /item never 500s on them.
+    await asyncio.to_thread(lambda: Blurb.__table__.create(bind=engine, checkfirst=True))
+    await asyncio.to_thread(_migrate_product_columns)
+    nlp = await asyncio.to_thread(_load_nlp)
+    # Pay encoder + tagger first-call costs here, not on the first real request
+    await asyncio.to_thread(warm_up)
+    await asyncio.to_thread(nlp, "warmup query for a sofa")
+    blurb_batcher.start()
+    yield
+    await blurb_batcher.stop()
+
+app = FastAPI(title="Furniture Recommendation API", version="3.1.0", lifespan=lifespan)
 add_cors(app)
 
 # Force port binding for Render
@@ -44,22 +102,26 @@ llm = ChatOpenAI(
     api_key=OPENROUTER_API_KEY,
     temperature=0.7,
 )
-desc_prompt = ChatPromptTemplate.from_template(
-    "Write a short, creative, under-60-word product blurb for: {title}. "
-    "Highlight materials, design vibe, and one specific use-case. Vary the tone each time."
-)
-description_chain = desc_prompt | llm | StrOutputParser()
+# All blurb generation funnels through the batcher: concurrent cache misses
+# coalesce into one multi-title prompt instead of N independent LLM calls.
+blurb_batcher = BlurbBatcher(llm)
 
-# spaCy for keyword extraction
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    import spacy.cli
-    spacy.cli.download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+# Fast path for the overwhelmingly common case: the query names a piece
+# of furniture directly, so no tagger run is needed at all.
+_FURNITURE_NOUNS = {
+    "sofa", "couch", "loveseat", "futon", "sectional", "chair", "armchair",
+    "recliner", "stool", "ottoman", "bench", "table", "desk", "nightstand",
+    "dresser", "wardrobe", "cabinet", "sideboard", "shelf", "bookcase",
+    "bed", "mattress", "headboard", "rug", "mat", "doormat", "carpet",
+    "lamp", "mirror", "hammock", "crib",
+}
 
 def extract_keyword(q: str) -> str:
-    doc = nlp(q.lower())
+    lowered = q.lower()
+    for w in reversed(re.findall(r"[a-z]+", lowered)):
+        if w in _FURNITURE_NOUNS:
+            return w
+    doc = nlp(lowered)
     for t in reversed(doc):
         if t.pos_ == "NOUN":
             return t.text
@@ -72,47 +134,61 @@ def extract_keyword(q: str) -> str:
 # 🧹 ID normalization helper (fixes %0A and control chars)
 # ---------------------------------------------------------
 _CTRL = ''.join(map(chr, list(range(0, 32)) + [127]))
-_CTRL_TABLE = str.maketrans('', '', _CTRL)
+# One table drops control chars, zero-width chars, and quotes in a single scan
+_ID_DROP_TABLE = str.maketrans('', '', _CTRL + '"\'\u200b\ufeff')
+_RE_TRAIL_NEWLINES = re.compile(r'(?:%0A|%0D)+$', re.IGNORECASE)
 
 def _normalize_id(raw: str) -> str:
     """
     Normalize product ID for DB lookup:
       - Strip whitespace, quotes, encoded newlines (%0A/%0D)
-      - Decode URL-encoded chars
+      - Decode URL-encoded chars (repeatedly, so double-encoding resolves too)
       - Remove control / zero-width chars
     """
     if raw is None:
         return ""
-    s = str(raw).strip().strip('"').strip("'")
-    s = re.sub(r'(?:%0A|%0D)+$', '', s, flags=re.IGNORECASE)
-    s = unquote(s)
-    s = s.replace('\u200b', '').replace('\ufeff', '')
-    s = s.translate(_CTRL_TABLE)
-    return s.strip()
+    s = _RE_TRAIL_NEWLINES.sub('', str(raw).strip())
+    prev = None
+    while s != prev:
+        prev, s = s, unquote(s)
+    return s.translate(_ID_DROP_TABLE).strip()
 
 # ---------------------------------------------------------
 # 🩺 Health check
 # ---------------------------------------------------------
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    cache = embed_cache_info()
+    logging.info(f"🧠 Embed cache: hits={cache['hits']} misses={cache['misses']}")
+    return {"status": "ok", "embed_cache": cache}
 
 # ---------------------------------------------------------
 # 🔍 Search Endpoint
 # ---------------------------------------------------------
 @app.post("/search", response_model=SearchResponse)
-def search(req: SearchRequest):
-    vec = embed_text(req.query)
-    res = query_index(vec, top_k=req.candidate_k)
+async def search(req: SearchRequest):
+    # Run the encoder and the Pinecone RTT off the event loop so one slow
+    # search doesn't pin the worker; other requests interleave meanwhile.
+    vec = await asyncio.to_thread(embed_text, req.query)
+    key = (req.must_contain or extract_keyword(req.query)).lower() if req.query else None
+
+    # With PINECONE_KEYWORD_FILTER set (index vectors carry "keywords"
+    # metadata), filter server-side so only qualifying items come back and
+    # top_k alone is enough; otherwise do the wide fetch and filter titles
+    # client-side. One Pinecone round-trip either way.
+    filtered = KEYWORD_FILTER and bool(key)
+    if filtered:
+        res = await asyncio.to_thread(query_index, vec, req.top_k, {"keywords": {"$in": [key]}})
+    else:
+        res = await asyncio.to_thread(query_index, vec, req.candidate_k)
     matches = res.get("matches", []) or []
 
-    key = (req.must_contain or extract_keyword(req.query)).lower() if req.query else None
     cards: List[ProductCard] = []
 
     for m in matches:
         md = m.get("metadata") or {}
         title = (md.get("title") or "Untitled").strip()
-        if key and key not in title.lower():
+        if key and not filtered and key not in title.lower():
             continue
 
         cards.append(ProductCard(
@@ -133,40 +209,58 @@ def search(req: SearchRequest):
 # 🪑 Item Details Endpoint (now returns normalized, display-ready fields)
 # ---------------------------------------------------------
 @app.get("/item/{id}", response_model=ProductDetail)
-def get_item(id: str, db: Session = Depends(get_db)):
+async def get_item(id: str, db: Session = Depends(get_db)):
     raw_id = id
     clean_id = _normalize_id(raw_id)
 
-    # Try normal and fallback lookups
-    prod = db.execute(select(Product).where(Product.id == clean_id)).scalar_one_or_none()
-    if not prod:
-        alt_id = _normalize_id(unquote(str(raw_id).strip()))
-        if alt_id and alt_id != clean_id:
-            prod = db.execute(select(Product).where(Product.id == alt_id)).scalar_one_or_none()
+    # Normalization fully decodes the id, so one lookup is enough.
+    # Session.get hits the identity map and the cached compiled PK statement.
+    prod = db.get(Product, clean_id)
 
     if not prod:
         logging.warning(f"❌ Product not found. raw='{raw_id}' normalized='{clean_id}'")
         raise HTTPException(status_code=404, detail=f"Product not found for id={clean_id or raw_id}")
 
-    # Generate creative description using LLM
+    # Creative description: served from the blurbs cache when warm, so the
+    # LLM round-trip (~1-3 s) only happens once per distinct title.
     title_for_llm = prod.title or "this item"
     creative = "A stylish, functional piece — built for everyday comfort."
+    blurb_key = hashlib.sha1(title_for_llm.encode()).hexdigest()
+    cached = None
     try:
-        logging.info(f"✅ Generating description via LangChain for: '{title_for_llm}'")
-        creative = description_chain.invoke({"title": title_for_llm}).strip()
+        cached = db.get(Blurb, blurb_key)
     except Exception as e:
-        logging.exception(f"❌ LLM generation failed: {e}")
+        logging.warning(f"⚠️ Blurb cache lookup failed, generating without it: {e}")
+        db.rollback()
+    if cached:
+        creative = cached.text
+    else:
+        try:
+            logging.info(f"✅ Generating description via LangChain for: '{title_for_llm}'")
+            creative = (await blurb_batcher.submit(title_for_llm)).strip()
+            try:
+                db.merge(Blurb(key=blurb_key, text=creative))
+                db.commit()
+            except Exception as e:
+                db.rollback()  # cache write is best-effort; still serve the blurb
+                logging.warning(f"⚠️ Blurb cache write failed: {e}")
+        except Exception as e:
+            logging.exception(f"❌ LLM generation failed: {e}")
 
-    # ---- Normalize for display (title/description/creative + features/dimensions) ----
-    norm = normalize_listing(
-        title=prod.title,
-        raw_description=prod.description or "",
-        raw_creative=creative,
-    )
+    # ---- Normalize for display ----
+    # Listing fields were precomputed at load time when available; only the
+    # freshly generated creative blurb still needs cleaning per request.
+    if prod.norm_title is not None or prod.norm_description is not None:
+        nice_title = prod.norm_title
+        nice_desc = prod.norm_description
+    else:
+        norm = normalize_listing(title=prod.title, raw_description=prod.description or "")
+        nice_title = norm["title"]
+        nice_desc = norm["description"]
 
     return ProductDetail(
         id=prod.id,
-        title=norm["title"] or prod.title,
+        title=nice_title or prod.title,
         brand=prod.brand,
         price=prod.price,
         main_category=prod.main_category,
@@ -175,8 +269,8 @@ def get_item(id: str, db: Session = Depends(get_db)):
         color=prod.color,
         main_image=prod.main_image,
         images=prod.images,
-        description=norm["description"] or None,
-        creative_description=norm["creative"] or None,
+        description=nice_desc or None,
+        creative_description=normalize_creative(creative),
     )
 
 # Add this at the very end of your main.py file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Text
+from sqlalchemy import Column, String, Float, Text, DateTime, func
 from sqlalchemy.types import JSON
 from .db import Base
 
@@ -20,4 +20,20 @@ class Product(Base):
 
     # Content
     description = Column(Text, nullable=True)
-    # NOTE: no creative_description column because we always generate fresh
+    # NOTE: no creative_description column because blurbs live in Blurb
+
+    # Display-ready fields precomputed at load time (see scripts/load_and_upsert.py);
+    # when present, /item skips normalize_listing entirely.
+    norm_title = Column(String, nullable=True)
+    norm_description = Column(Text, nullable=True)
+    features = Column(JSON, nullable=True)     # list[str] synthesized bullets
+    dimensions = Column(JSON, nullable=True)   # parsed dims dict
+
+
+class Blurb(Base):
+    """LLM-generated blurb cache, keyed by sha1 of the product title."""
+    __tablename__ = "blurbs"
+
+    key = Column(String, primary_key=True)
+    text = Column(Text, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
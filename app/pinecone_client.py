@@ -1,11 +1,24 @@
 import os
 import json
+import functools
 from typing import List, Dict, Any, Union, Optional
 
 from dotenv import load_dotenv
 from pinecone import Pinecone
 
+# Optional: gRPC transport (pip install "pinecone[grpc]") — multiplexes over
+# one HTTP/2 connection with keepalive instead of per-request TLS handshakes
+try:
+    from pinecone.grpc import PineconeGRPC
+except Exception:
+    PineconeGRPC = None  # fall back to REST
+
+# Keep HF tokenizers from spawning thread pools under uvicorn workers
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
 # Optional: local embeddings (default)
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
 # Optional: Space embeddings if you want to pull from your HF Space
@@ -14,6 +27,13 @@ try:
 except Exception:
     GradioClient = None  # only needed if USE_SPACE_EMBED=true
 
+# Optional: quantized ONNX encoder (see scripts/export_onnx_int8.py)
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+except Exception:
+    ort = None  # only needed if EMBED_BACKEND=onnx_int8
+
 # --- Load .env safely (optional for local dev) ---
 load_dotenv()
 
@@ -23,30 +43,75 @@ PINECONE_INDEX = os.getenv("PINECONE_INDEX", "product-recommendations")
 
 # Embedding config
 EMBED_MODEL = os.getenv("EMBED_MODEL", "all-mpnet-base-v2")
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")  # "torch" | "onnx_int8"
+ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", "onnx/model.int8.onnx")
 USE_SPACE_EMBED = os.getenv("USE_SPACE_EMBED", "false").lower() in {"1", "true", "yes"}
 IKARUS_SPACE = os.getenv("IKARUS_SPACE", "asr3232/ikarus_3d")
 
+# Opt-in: only set this when the index's vectors carry a "keywords" metadata
+# list (attached by whatever job upserts them); /search then filters
+# server-side instead of discarding non-matching titles client-side.
+KEYWORD_FILTER = os.getenv("PINECONE_KEYWORD_FILTER", "false").lower() in {"1", "true", "yes"}
+
 # --- Validation ---
 if not PINECONE_API_KEY:
     raise RuntimeError("❌ Missing PINECONE_API_KEY in your .env file.")
 
 print(f"✅ Using Pinecone index: {PINECONE_INDEX}")
-print(f"✅ Embedding source: {'HF Space /embed_fn' if USE_SPACE_EMBED else EMBED_MODEL}")
+print(f"✅ Embedding source: {'HF Space /embed_fn' if USE_SPACE_EMBED else f'{EMBED_MODEL} ({EMBED_BACKEND})'}")
+
+# --- Initialize Pinecone (one shared client; gRPC when available) ---
+if PineconeGRPC is not None:
+    pc = PineconeGRPC(api_key=PINECONE_API_KEY)
+else:
+    pc = Pinecone(api_key=PINECONE_API_KEY)
+index = pc.Index(PINECONE_INDEX, pool_threads=32)
+print(f"✅ Pinecone transport: {'gRPC' if PineconeGRPC is not None else 'REST'}")
+
+class _OnnxEncoder:
+    """
+    int8-quantized encoder via ONNX Runtime (export with scripts/export_onnx_int8.py).
+    Drop-in for SentenceTransformer.encode: tokenize, mean-pool, L2-normalize.
+    """
+
+    def __init__(self, model_path: str, model_name: str):
+        so = ort.SessionOptions()
+        so.intra_op_num_threads = os.cpu_count() or 1
+        self._session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"], sess_options=so)
+        repo = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        self._tokenizer = AutoTokenizer.from_pretrained(repo)
+
+    def encode(self, texts: Union[str, List[str]], **_) -> np.ndarray:
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        enc = self._tokenizer(batch, padding=True, truncation=True, max_length=128, return_tensors="np")
+        feeds = {i.name: enc[i.name] for i in self._session.get_inputs() if i.name in enc}
+        hidden = self._session.run(None, feeds)[0]
+        mask = enc["attention_mask"][..., None].astype(hidden.dtype)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-9, None)
+        return pooled[0] if single else pooled
 
-# --- Initialize Pinecone ---
-pc = Pinecone(api_key=PINECONE_API_KEY)
-index = pc.Index(PINECONE_INDEX)
 
 # --- Embedding providers ---
-_embedder: Optional[SentenceTransformer] = None
+_embedder = None  # SentenceTransformer or _OnnxEncoder
 _space_client: Optional[GradioClient] = None
 
 if USE_SPACE_EMBED:
     if GradioClient is None:
         raise RuntimeError("USE_SPACE_EMBED=true but gradio_client is not installed. `pip install gradio_client`")
     _space_client = GradioClient(IKARUS_SPACE)
+elif EMBED_BACKEND == "onnx_int8":
+    if ort is None:
+        raise RuntimeError("EMBED_BACKEND=onnx_int8 but onnxruntime/transformers not installed. `pip install onnxruntime transformers`")
+    _embedder = _OnnxEncoder(ONNX_MODEL_PATH, EMBED_MODEL)
 else:
+    # Few intra-op threads per worker: uvicorn already parallelizes across
+    # processes, so letting torch spawn a full pool just thrashes the CPU.
+    torch.set_num_threads(min(4, os.cpu_count() or 1))
+    torch.set_grad_enabled(False)  # inference only; no autograd tape
     _embedder = SentenceTransformer(EMBED_MODEL)
+    _embedder.max_seq_length = 128  # queries are short; skip wasted padding
 
 
 def _coerce_json(x: Any):
@@ -59,15 +124,13 @@ def _coerce_json(x: Any):
 
 
 # --- Core functions ---
-def embed_text(text: str) -> List[float]:
+@functools.lru_cache(maxsize=4096)
+def _embed_text_cached(text: str) -> tuple:
     """
-    Convert query text into a vector.
+    Uncached embedding work; returns a tuple so lru_cache entries stay immutable.
     - Default: SentenceTransformer local model
     - If USE_SPACE_EMBED=true: calls Space /embed_fn (expects [{ "embeddings": [[...]] }])
     """
-    if not text:
-        return []
-
     if USE_SPACE_EMBED and _space_client:
         res: Union[List, Dict, str] = _space_client.predict(
             multiline_text=text,
@@ -81,27 +144,64 @@ def embed_text(text: str) -> List[float]:
             emb = res[0].get("embeddings") or res[0].get("embedding")
             if isinstance(emb, list):
                 vec = emb[0] if emb and isinstance(emb[0], list) else emb
-                return [float(v) for v in vec]
+                return tuple(np.asarray(vec, dtype=np.float32).tolist())
 
         # Fallbacks
         if isinstance(res, dict):
             emb = res.get("embeddings") or res.get("embedding") or res.get("vector") or res.get("data")
             if isinstance(emb, list):
                 vec = emb[0] if emb and isinstance(emb[0], list) else emb
-                return [float(v) for v in vec]
+                return tuple(np.asarray(vec, dtype=np.float32).tolist())
 
         if isinstance(res, list) and res and isinstance(res[0], (int, float)):
-            return [float(v) for v in res]
+            return tuple(np.asarray(res, dtype=np.float32).tolist())
 
         raise ValueError(f"Unexpected /embed_fn response shape: {type(res)} -> {res}")
 
     # Local model path
-    return _embedder.encode(text).tolist()
+    return tuple(_embedder.encode(text).tolist())
+
+
+def embed_text(text: str) -> List[float]:
+    """Convert query text into a vector, caching repeat queries in an LRU."""
+    if not text:
+        return []
+    return list(_embed_text_cached(text))
+
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Batch-encode multiple texts in one forward pass (local model only).
+    Amortizes tokenization + dispatch: one matmul per batch instead of N.
+    """
+    if not texts:
+        return []
+    if USE_SPACE_EMBED:
+        return [embed_text(t) for t in texts]
+    vecs = _embedder.encode(texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True)
+    return vecs.tolist()
+
+
+def warm_up():
+    """
+    Run one dummy encode so BLAS init / kernel selection happens before the
+    load balancer routes real traffic (called from the FastAPI lifespan).
+    """
+    try:
+        _embed_text_cached("warmup")
+    except Exception as e:
+        print(f"⚠️ Embedding warm-up failed: {e}")
+
+
+def embed_cache_info() -> Dict[str, int]:
+    """Hit/miss stats for the query-embedding LRU (surfaced on /health)."""
+    info = _embed_text_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
 
 
-def query_index(vec: List[float], top_k: int) -> Dict[str, Any]:
+def query_index(vec: List[float], top_k: int, filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Search Pinecone index for similar items based on embedding vector."""
-    return index.query(vector=vec, top_k=top_k, include_metadata=True)
+    return index.query(vector=vec, top_k=top_k, include_metadata=True, filter=filter)
 
 
 def fetch_by_ids(ids: List[str]) -> Dict[str, Any]:
@@ -0,0 +1,37 @@
+# scripts/export_onnx_int8.py
+"""
+One-shot build step: export the embedding model to ONNX and quantize to int8.
+
+    python scripts/export_onnx_int8.py [output_dir]
+
+Then run the API with EMBED_BACKEND=onnx_int8 (and optionally
+ONNX_MODEL_PATH=<output_dir>/model.int8.onnx).
+
+Requires: pip install optimum[exporters] onnxruntime
+"""
+import os, sys, subprocess
+
+EMBED_MODEL = os.getenv("EMBED_MODEL", "all-mpnet-base-v2")
+
+
+def main(out_dir: str = "onnx"):
+    repo = EMBED_MODEL if "/" in EMBED_MODEL else f"sentence-transformers/{EMBED_MODEL}"
+    os.makedirs(out_dir, exist_ok=True)
+
+    print(f"⏳ Exporting {repo} to ONNX...")
+    subprocess.run(
+        ["optimum-cli", "export", "onnx", "--model", repo, "--task", "feature-extraction", out_dir],
+        check=True,
+    )
+
+    print("⏳ Quantizing to int8...")
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    src = os.path.join(out_dir, "model.onnx")
+    dst = os.path.join(out_dir, "model.int8.onnx")
+    quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+
+    print(f"✅ Quantized model written to {dst}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "onnx")
@@ -1,9 +1,14 @@
 # scripts/load_db_only.py
-import os, sys, json, pandas as pd
+import os, sys, json, hashlib, pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.normalize import normalize_listing  # noqa: E402
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, Column, String, Float, Text
+from sqlalchemy import create_engine, inspect, text, Column, String, Float, Text, DateTime, func
 from sqlalchemy.types import JSON
-from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
+from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # Load environment variables (optional for local dev)
 load_dotenv()
@@ -32,9 +37,35 @@ class Product(Base):
     main_image = Column(Text, nullable=True)   # one hero image
     images = Column(JSON, nullable=True)       # list[str] gallery
     description = Column(Text, nullable=True)
+    norm_title = Column(String, nullable=True)
+    norm_description = Column(Text, nullable=True)
+    features = Column(JSON, nullable=True)
+    dimensions = Column(JSON, nullable=True)
+
+class Blurb(Base):
+    __tablename__ = "blurbs"
+    key = Column(String, primary_key=True)     # sha1 of the title
+    text = Column(Text, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
 
 Base.metadata.create_all(bind=engine)
 
+# create_all never ALTERs existing tables; add the normalized-field columns
+# to products tables created before they existed (idempotent)
+_NEW_PRODUCT_COLUMNS = {
+    "norm_title": "VARCHAR",
+    "norm_description": "TEXT",
+    "features": "JSON",
+    "dimensions": "JSON",
+}
+_existing_cols = {c["name"] for c in inspect(engine).get_columns("products")}
+with engine.begin() as _conn:
+    for _name, _ddl in _NEW_PRODUCT_COLUMNS.items():
+        if _name not in _existing_cols:
+            _conn.execute(text(f"ALTER TABLE products ADD COLUMN {_name} {_ddl}"))
+
+_insert_fn = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+
 def pick_id_col(df):
     for c in ["uniq_id", "id", "sku", "product_id"]:
         if c in df.columns:
@@ -42,15 +73,9 @@ def pick_id_col(df):
     df["id"] = df.index.astype(str)
     return "id"
 
-def to_float(v):
-    if v is None or (isinstance(v, float) and pd.isna(v)): return None
-    s = str(v).replace("$", "").strip()
-    try: return float(s)
-    except: return None
-
 def parse_images(v):
     """Accept list as-is; if string that looks like JSON list -> json.loads; if comma string -> split; else None/[]"""
-    if v is None or (isinstance(v, float) and pd.isna(v)): return None
+    if v is None or (isinstance(v, float) and v != v): return None  # scalar NaN check, no pd.isna call
     if isinstance(v, list): return v
     if isinstance(v, str):
         v = v.strip()
@@ -63,36 +88,119 @@ def parse_images(v):
         return [v]  # single URL string
     return None
 
+# 15 bind params per row: 1000 rows stays well under SQLite's 32,766
+# variable limit and psycopg's 65,535 wire-protocol cap
+CHUNK_SIZE = 1000
+
+_STR_COLS = ["brand", "main_category", "categories", "material", "color", "main_image", "description"]
+
 def main(csv_path: str):
     df = pd.read_csv(csv_path)
     id_col = pick_id_col(df)
 
-    # Only map known columns; missing ones become None
-    cols = {
-        "title": "title", "brand": "brand", "price": "price",
-        "main_category": "main_category", "categories": "categories",
-        "material": "material", "color": "color",
-        "main_image": "main_image", "images": "images",
-        "description": "description"
-    }
-    with Session(engine) as session:
-        for _, r in df.iterrows():
-            p = Product(
-                id=str(r[id_col]),
-                title=str(r.get(cols["title"]) or "") if cols["title"] in df.columns else None,
-                brand=str(r.get(cols["brand"])) if cols["brand"] in df.columns and pd.notna(r.get(cols["brand"])) else None,
-                price=to_float(r.get(cols["price"])) if cols["price"] in df.columns else None,
-                main_category=str(r.get(cols["main_category"])) if cols["main_category"] in df.columns and pd.notna(r.get(cols["main_category"])) else None,
-                categories=str(r.get(cols["categories"])) if cols["categories"] in df.columns and pd.notna(r.get(cols["categories"])) else None,
-                material=str(r.get(cols["material"])) if cols["material"] in df.columns and pd.notna(r.get(cols["material"])) else None,
-                color=str(r.get(cols["color"])) if cols["color"] in df.columns and pd.notna(r.get(cols["color"])) else None,
-                main_image=str(r.get(cols["main_image"])) if cols["main_image"] in df.columns and pd.notna(r.get(cols["main_image"])) else None,
-                images=parse_images(r.get(cols["images"])) if cols["images"] in df.columns else None,
-                description=str(r.get(cols["description"])) if cols["description"] in df.columns and pd.notna(r.get(cols["description"])) else None,
+    # Vectorized cleanup: one pandas pass per column instead of per-cell checks
+    out = pd.DataFrame()
+    out["id"] = df[id_col].astype(str)
+    out["title"] = df["title"].fillna("").astype(str) if "title" in df.columns else None
+    for c in _STR_COLS:
+        out[c] = df[c].astype(str).where(df[c].notna(), None) if c in df.columns else None
+    if "price" in df.columns:
+        price = pd.to_numeric(df["price"].astype(str).str.replace("$", "", regex=False), errors="coerce")
+        out["price"] = price.astype(object).where(price.notna(), None)
+    else:
+        out["price"] = None
+    out["images"] = df["images"].map(parse_images) if "images" in df.columns else None
+
+    # Precompute display-ready fields once here so /item never pays for
+    # normalize_listing on the hot path
+    norm_titles, norm_descs, feats, dims = [], [], [], []
+    for row in out[["title", "description"]].itertuples(index=False):
+        n = normalize_listing(title=row.title or None, raw_description=row.description or "")
+        norm_titles.append(n["title"])
+        norm_descs.append(n["description"])
+        feats.append(n["features"])
+        dims.append(n["dimensions"])
+    out["norm_title"] = norm_titles
+    out["norm_description"] = norm_descs
+    out["features"] = feats
+    out["dimensions"] = dims
+
+    records = out.to_dict(orient="records")
+    update_cols = [c for c in out.columns if c != "id"]
+
+    # One prepared upsert per chunk instead of a SELECT+INSERT/UPDATE per row
+    with engine.begin() as conn:
+        for start in range(0, len(records), CHUNK_SIZE):
+            chunk = records[start:start + CHUNK_SIZE]
+            stmt = _insert_fn(Product.__table__).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["id"],
+                set_={c: stmt.excluded[c] for c in update_cols},
             )
-            session.merge(p)  # upsert
-        session.commit()
-    print("✅ DB loaded (main_image + images kept exactly as in CSV).")
+            conn.execute(stmt)
+    print(f"✅ DB loaded: {len(records)} rows upserted in chunks of {CHUNK_SIZE}.")
+
+    if os.getenv("GENERATE_BLURBS") == "1":
+        generate_blurbs(out["title"].tolist())
+
+BLURB_BATCH = 16
+
+def generate_blurbs(titles):
+    """Pre-populate the blurbs cache offline, BLURB_BATCH titles per prompt.
+
+    Batching titles into one prompt is ~10x cheaper per blurb than the
+    one-request-per-title path /item falls back to on a cold cache.
+    """
+    from langchain_openai import ChatOpenAI
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import StrOutputParser
+
+    api_key = os.getenv("OPENROUTER_API_KEY") or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("⚠️ GENERATE_BLURBS=1 but no OPENROUTER_API_KEY; skipping blurbs.")
+        return
+
+    llm = ChatOpenAI(
+        base_url="https://openrouter.ai/api/v1",
+        model="gpt-4o-mini",
+        api_key=api_key,
+        temperature=0.7,
+    )
+    prompt = ChatPromptTemplate.from_template(
+        "For each numbered product title below, write a short, creative, "
+        "under-60-word blurb highlighting materials, design vibe, and one "
+        "specific use-case. Return ONLY a JSON array of {n} strings, in order.\n\n{titles}"
+    )
+    chain = prompt | llm | StrOutputParser()
+
+    titles = [t for t in dict.fromkeys(titles) if t]
+    done = 0
+    for start in range(0, len(titles), BLURB_BATCH):
+        batch = titles[start:start + BLURB_BATCH]
+        numbered = "\n".join(f"{i + 1}. {t}" for i, t in enumerate(batch))
+        try:
+            raw = chain.invoke({"n": len(batch), "titles": numbered}).strip()
+            raw = raw[raw.index("["):raw.rindex("]") + 1]
+            blurbs = json.loads(raw)
+            if len(blurbs) != len(batch):
+                # a skipped/merged entry would persist every later blurb
+                # under the wrong title's key — refuse the whole batch
+                raise ValueError(f"expected {len(batch)} blurbs, got {len(blurbs)}")
+        except Exception as e:
+            print(f"⚠️ Blurb batch at offset {start} failed: {e}")
+            continue
+        rows = [
+            {"key": hashlib.sha1(t.encode()).hexdigest(), "text": str(b).strip()}
+            for t, b in zip(batch, blurbs) if str(b).strip()
+        ]
+        if not rows:
+            continue
+        with engine.begin() as conn:
+            stmt = _insert_fn(Blurb.__table__).values(rows)
+            stmt = stmt.on_conflict_do_update(index_elements=["key"], set_={"text": stmt.excluded.text})
+            conn.execute(stmt)
+        done += len(rows)
+    print(f"✅ Pre-generated {done} blurbs in batches of {BLURB_BATCH}.")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2: